@@ -0,0 +1,113 @@
+# backend/benchmarks/chunking_benchmark.py
+"""
+Compare the legacy greedy TTS splitter with ChunkPlanner.
+
+Run from the backend directory:
+    python -m benchmarks.chunking_benchmark
+"""
+import random
+import re
+import statistics
+import time
+
+from services.chunking import ChunkPlanner
+
+MAX_CHARS = 4000
+WORDS = (
+    "audio article feed podcast listener narration voice sentence paragraph heading "
+    "latency synthesis request chunk content reader model browser server network "
+    "the a of and to in is that for it with as on was by"
+).split()
+
+
+def greedy_split(text: str, chunk_size: int = MAX_CHARS) -> list[str]:
+    """The original AudioService.split_text, kept as the baseline"""
+    sentences = re.split(r'(?<=[.!?])\s+', text)
+    chunks = []
+    current_chunk = ""
+    for sentence in sentences:
+        if len(current_chunk) + len(sentence) > chunk_size:
+            if current_chunk:
+                chunks.append(current_chunk.strip())
+            current_chunk = sentence
+        else:
+            current_chunk += " " + sentence if current_chunk else sentence
+    if current_chunk:
+        chunks.append(current_chunk.strip())
+    return chunks
+
+
+def make_sentence(rng: random.Random, min_words: int = 6, max_words: int = 30) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))]
+    clause_breaks = rng.sample(range(1, len(words)), k=min(2, len(words) - 1))
+    for i in clause_breaks:
+        words[i - 1] += ","
+    return " ".join(words).capitalize() + "."
+
+
+def make_article(rng: random.Random, target_chars: int, long_sentence: bool = False) -> str:
+    """Markdown shaped like scrape_content output: title, description, headings, paragraphs"""
+    parts = ["# Benchmark article", "*A synthetic article for chunking benchmarks*"]
+    length = 0
+    while length < target_chars:
+        if rng.random() < 0.15:
+            parts.append(f"## {make_sentence(rng, 3, 6).rstrip('.')}")
+        paragraph = " ".join(make_sentence(rng) for _ in range(rng.randint(2, 7)))
+        if long_sentence and length > target_chars // 3:
+            paragraph = make_sentence(rng, 900, 1000)
+            long_sentence = False
+        parts.append(paragraph)
+        length += len(paragraph) + 2
+    return "\n\n".join(parts)
+
+
+def make_near_limit_article(rng: random.Random) -> str:
+    """A short sentence directly before a sentence just under the chunk limit"""
+    filler = make_article(rng, 2900)
+    long_sentence = "A" * 34 + ". " + ("word " * 798).strip() + "."
+    return f"{filler}\n\n{long_sentence}\n\n{filler}"
+
+
+def describe(chunks: list[str]) -> str:
+    sizes = [len(chunk) for chunk in chunks]
+    oversized = sum(size > 4096 for size in sizes)
+    empty = sum(size == 0 for size in sizes)
+    return (
+        f"chunks={len(sizes):>2}  min={min(sizes):>5}  max={max(sizes):>5}  "
+        f"spread={max(sizes) - min(sizes):>5}  stdev={statistics.pstdev(sizes):>7.1f}  "
+        f"oversized={oversized}  empty={empty}"
+    )
+
+
+def timed(func, *args, repeat: int = 20, **kwargs):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(*args, **kwargs)
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    rng = random.Random(42)
+    planner = ChunkPlanner(max_chars=MAX_CHARS)
+    cases = [
+        ("4.5k chars", make_article(rng, 4500)),
+        ("9k chars", make_article(rng, 9000)),
+        ("12.5k chars", make_article(rng, 12500)),
+        ("16k chars", make_article(rng, 16000)),
+        ("9k + oversized sentence", make_article(rng, 9000, long_sentence=True)),
+        ("short sentence before near-limit sentence", make_near_limit_article(rng)),
+        ("16k of very short sentences", "Yes. " * 3200),
+    ]
+
+    for name, text in cases:
+        print(f"\n{name} ({len(text)} chars)")
+        greedy, greedy_ms = timed(greedy_split, text)
+        balanced, balanced_ms = timed(planner.plan, text)
+        fast_start, fast_start_ms = timed(planner.plan, text, first_chunk_chars=600)
+        print(f"  greedy      {describe(greedy)}  {greedy_ms:.2f}ms")
+        print(f"  balanced    {describe(balanced)}  {balanced_ms:.2f}ms")
+        print(f"  fast start  {describe(fast_start)}  {fast_start_ms:.2f}ms  first={len(fast_start[0])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,10 @@ import re
 from services.text_to_speech import AudioService
 from services.storage import S3Storage
 from services.feed import RSSFeed
+from services.audio_profile import AudioProfile, get_profile
+from services.extraction import ExtractionProfileStore
+from services.subscriptions import SubscriptionService
+from typing import Optional
 import os
 import dotenv
 import asyncio
@@ -40,12 +44,51 @@ app.add_middleware(
 audio_service = AudioService()
 storage_service = S3Storage()
 feed_service = RSSFeed(str(audio_service.temp_dir))
+extraction_profiles = ExtractionProfileStore()
+subscription_service = SubscriptionService(
+    str(audio_service.temp_dir),
+    lambda url: build_article(url),  # Defined below; background builds use the default profile
+    poll_interval=int(os.getenv('SUBSCRIPTION_POLL_INTERVAL', '900')),
+    max_concurrency=int(os.getenv('PREFETCH_CONCURRENCY', '2'))
+)
+
+@app.on_event("startup")
+async def start_subscriptions():
+    subscription_service.start()
+
+@app.on_event("shutdown")
+async def stop_subscriptions():
+    await subscription_service.stop()
 
 # Mount temp directory for serving audio files
 app.mount("/audio", StaticFiles(directory=str(audio_service.temp_dir)), name="audio")
 
 class UrlInput(BaseModel):
     url: str
+    # Optional audio settings; unset fields fall back to the deployment default
+    profile: Optional[str] = None
+    model: Optional[str] = None
+    voice: Optional[str] = None
+    response_format: Optional[str] = None
+    speed: Optional[float] = None
+    bitrate: Optional[str] = None
+
+class SubscriptionInput(BaseModel):
+    url: str
+
+def resolve_profile(input: UrlInput) -> AudioProfile:
+    """Build the audio profile for a request: named profile or deployment default, plus overrides"""
+    try:
+        base = get_profile(input.profile) if input.profile else audio_service.default_profile
+        return base.with_overrides(
+            model=input.model,
+            voice=input.voice,
+            response_format=input.response_format,
+            speed=input.speed,
+            bitrate=input.bitrate
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 MAX_CONTENT_LENGTH = 16000
 TRUNCATION_MESSAGE = "\n\n[Article truncated due to length]"
@@ -85,15 +128,8 @@ async def scrape_content(url: str) -> str:
             for svg in soup.find_all('svg'):
                 svg.decompose()
 
-            # Try to find the main content
-            content_priorities = [
-                soup.find('article'),
-                soup.find('main'),
-                soup.find(class_=re.compile(r'article|content|post|entry')),
-                soup.find('body')
-            ]
-            
-            main_content = next((content for content in content_priorities if content), None)
+            # Find the main content, trying the selector learned for this host first
+            main_content = extraction_profiles.find_main_content(soup, str(response.url))
             
             if not main_content:
                 raise HTTPException(status_code=400, detail="Could not find main content")
@@ -153,32 +189,28 @@ async def scrape_content(url: str) -> str:
         
 @app.post("/api/scrape")
 async def scrape_url(input: UrlInput):
+    """
+    Fast preview: synthesize the opening chunk with the low-latency model and serve
+    it locally. Nothing is uploaded or added to the feed; the cached preview is
+    reused as the opening segment when the full article is converted.
+    """
     try:
+        profile = resolve_profile(input)
+
         # First scrape the content
         content = await scrape_content(input.url)
         
-        # Extract title
-        title = content.split('\n')[0].replace('#', '').strip() if content else "Untitled Article"
-        
-        # Get preview text for audio (first 100 words)
-        preview_text = ' '.join(content.split()[:100])
-        
-        # Create audio file locally
-        audio_path = await audio_service.create_audio(preview_text, title)
-        
-        # Upload to S3
-        audio_url = await storage_service.upload_audio(audio_path, title)
-        
-        # Update RSS feed
-        feed_service.add_item(title, audio_url, input.url)
+        # Create (or reuse) the preview audio locally
+        audio_path = await audio_service.create_preview(content, profile)
         
         # Get local audio URL for immediate playback
-        audio_filename = os.path.basename(audio_path)
+        audio_filename = os.path.relpath(audio_path, audio_service.temp_dir).replace(os.sep, '/')
         local_audio_url = f"/audio/{audio_filename}"
         
         return {
             "content": content,
-            "audio_url": local_audio_url  # Return local URL for immediate playback
+            "audio_url": local_audio_url,  # Return local URL for immediate playback
+            "preview": True
         }
         
     except HTTPException as e:
@@ -187,29 +219,51 @@ async def scrape_url(input: UrlInput):
         print(f"Error in scrape_url: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def build_article(url: str, profile: Optional[AudioProfile] = None) -> dict:
+    """Full conversion: scrape, synthesize, upload to S3 and add to the RSS feed"""
+    profile = profile or audio_service.default_profile
+
+    # First scrape the content
+    content = await scrape_content(url)
+    
+    # Extract title
+    title = content.split('\n')[0].replace('#', '').strip() if content else "Untitled Article"
+    
+    # Create audio file locally
+    audio_path = await audio_service.create_audio(content, title, profile)
+    
+    # Upload to S3
+    audio_url = await storage_service.upload_audio(audio_path, title, profile)
+    
+    # Update RSS feed in a worker thread (blocking HTTP and S3 calls)
+    await asyncio.to_thread(feed_service.add_item, title, audio_url, url, profile.content_type)
+    
+    return {
+        "content": content,
+        "title": title,
+        "audio_url": audio_url,
+        "audio_path": audio_path,
+        "profile": profile.cache_key()
+    }
+
+async def get_article(url: str, profile: AudioProfile) -> dict:
+    """Return the pre-built result for a subscribed article, or build it now"""
+    article = await subscription_service.lookup(url)
+    if article and article["profile"] == profile.cache_key() and os.path.exists(article["audio_path"]):
+        return article
+    return await build_article(url, profile)
+
 # Modify your convert_url endpoint to include RSS feed updates
 @app.post("/api/convert")
 async def convert_url(input: UrlInput):
     try:
-        # First scrape the content
-        content = await scrape_content(input.url)
-        
-        # Extract title
-        title = content.split('\n')[0].replace('#', '').strip() if content else "Untitled Article"
-        
-        # Create audio file locally
-        audio_path = await audio_service.create_audio(content, title)
-        
-        # Upload to S3
-        audio_url = await storage_service.upload_audio(audio_path, title)
-        
-        # Update RSS feed
-        feed_service.add_item(title, audio_url, input.url)
+        profile = resolve_profile(input)
+        article = await get_article(input.url, profile)
         
         return {
             "status": "success",
-            "content": content,
-            "audio_url": audio_url,
+            "content": article["content"],
+            "audio_url": article["audio_url"],
             "feed_url": "/audio/feed.xml"  # Accessible via your static files mount
         }
         
@@ -227,6 +281,32 @@ async def get_feed():
         return FileResponse(feed_path, media_type='application/xml')
     raise HTTPException(status_code=404, detail="Feed not found")
 
+@app.get("/api/extraction/stats")
+async def extraction_stats():
+    """Hit rates of the per-host extraction profiles"""
+    return extraction_profiles.stats()
+
+@app.get("/api/subscriptions")
+async def list_subscriptions():
+    return {"subscriptions": subscription_service.list_sources()}
+
+@app.post("/api/subscriptions")
+async def add_subscription(input: SubscriptionInput):
+    """Register an RSS/Atom feed or sitemap whose new articles are pre-built in the background"""
+    try:
+        source = subscription_service.add(input.url)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    subscription_service.poll_soon(source["url"])
+    return source
+
+@app.delete("/api/subscriptions")
+async def remove_subscription(url: str):
+    if not subscription_service.remove(url):
+        raise HTTPException(status_code=404, detail="Subscription not found")
+    return {"status": "removed"}
+
 @app.get("/api/health")
 async def health_check():
     return {"status": "healthy"}
@@ -253,17 +333,9 @@ async def extract_content(input: UrlInput):
 async def generate_audio(input: UrlInput):
     """New endpoint that handles audio generation"""
     try:
-        content = await scrape_content(input.url)
-        title = content.split('\n')[0].replace('#', '').strip() if content else "Untitled Article"
-        
-        # Create audio file locally
-        audio_path = await audio_service.create_audio(content, title)
-        
-        # Upload to S3
-        audio_url = await storage_service.upload_audio(audio_path, title)
-        
-        # Update RSS feed
-        feed_service.add_item(title, audio_url, input.url)
+        profile = resolve_profile(input)
+        article = await get_article(input.url, profile)
+        audio_path = article["audio_path"]
         
         # Get local audio URL for immediate playback
         audio_filename = os.path.basename(audio_path)
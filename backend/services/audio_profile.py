@@ -0,0 +1,140 @@
+# backend/services/audio_profile.py
+import hashlib
+import os
+import re
+from typing import Optional
+
+# OpenAI response_format ->
+#   (content type, file extension, ffmpeg input format, ffmpeg output format, ffmpeg codec)
+# Input and output formats differ for AAC: ffmpeg reads raw ADTS streams with
+# the "aac" demuxer but writes them with the "adts" muxer.
+AUDIO_FORMATS = {
+    'mp3': ('audio/mpeg', 'mp3', 'mp3', 'mp3', None),
+    'opus': ('audio/ogg', 'opus', 'ogg', 'ogg', 'libopus'),  # OpenAI returns Opus in an Ogg container
+    'aac': ('audio/aac', 'aac', 'aac', 'adts', 'aac'),
+    'flac': ('audio/flac', 'flac', 'flac', 'flac', None),
+    'wav': ('audio/wav', 'wav', 'wav', 'wav', None),
+}
+
+TTS_MODELS = ('tts-1', 'tts-1-hd')
+TTS_VOICES = ('alloy', 'echo', 'fable', 'onyx', 'nova', 'shimmer')
+BITRATE_PATTERN = re.compile(r'\d{1,3}k')  # Passed to ffmpeg as -b:a, e.g. '32k'
+
+
+class AudioProfile:
+    """
+    Settings that decide how an article is synthesized and stored: TTS model,
+    voice, speed, output format and (optionally) the bitrate used when the
+    audio is re-encoded.
+    """
+
+    def __init__(
+        self,
+        model: str = 'tts-1-hd',
+        voice: str = 'echo',
+        response_format: str = 'mp3',
+        speed: float = 1.0,
+        bitrate: Optional[str] = None
+    ):
+        if model not in TTS_MODELS:
+            raise ValueError(f"Unknown TTS model: {model}")
+        if voice not in TTS_VOICES:
+            raise ValueError(f"Unknown TTS voice: {voice}")
+        if response_format not in AUDIO_FORMATS:
+            raise ValueError(f"Unsupported audio format: {response_format}")
+        if not 0.25 <= speed <= 4.0:
+            raise ValueError("Speed must be between 0.25 and 4.0")
+        if bitrate is not None and not BITRATE_PATTERN.fullmatch(bitrate):
+            raise ValueError(f"Invalid bitrate: {bitrate} (expected e.g. '64k')")
+
+        self.model = model
+        self.voice = voice
+        self.response_format = response_format
+        self.speed = speed
+        self.bitrate = bitrate
+
+    @property
+    def content_type(self) -> str:
+        return AUDIO_FORMATS[self.response_format][0]
+
+    @property
+    def extension(self) -> str:
+        return AUDIO_FORMATS[self.response_format][1]
+
+    @property
+    def decode_format(self) -> str:
+        return AUDIO_FORMATS[self.response_format][2]
+
+    @property
+    def export_format(self) -> str:
+        return AUDIO_FORMATS[self.response_format][3]
+
+    @property
+    def codec(self) -> Optional[str]:
+        return AUDIO_FORMATS[self.response_format][4]
+
+    def speech_params(self) -> dict:
+        """Keyword arguments for client.audio.speech.create"""
+        return {
+            'model': self.model,
+            'voice': self.voice,
+            'response_format': self.response_format,
+            'speed': self.speed,
+        }
+
+    def cache_key(self) -> str:
+        """Short stable key; audio produced with different settings never collides"""
+        raw = f"{self.model}|{self.voice}|{self.response_format}|{self.speed}|{self.bitrate or ''}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:10]
+
+    def with_overrides(self, **overrides) -> 'AudioProfile':
+        """Copy of this profile with any non-None overrides applied"""
+        settings = {
+            'model': self.model,
+            'voice': self.voice,
+            'response_format': self.response_format,
+            'speed': self.speed,
+            'bitrate': self.bitrate,
+        }
+        settings.update({key: value for key, value in overrides.items() if value is not None})
+        return AudioProfile(**settings)
+
+    def __repr__(self) -> str:
+        return (
+            f"AudioProfile(model={self.model!r}, voice={self.voice!r}, "
+            f"response_format={self.response_format!r}, speed={self.speed}, bitrate={self.bitrate!r})"
+        )
+
+
+# Named profiles that can be selected per request or per deployment (TTS_PROFILE)
+PROFILES = {
+    'hd': AudioProfile(),
+    'fast': AudioProfile(model='tts-1'),
+    'compact': AudioProfile(response_format='opus', bitrate='32k'),
+    'compact-aac': AudioProfile(response_format='aac', bitrate='64k'),
+}
+
+
+def default_profile() -> AudioProfile:
+    """
+    Deployment default: the named profile in TTS_PROFILE (default 'hd'), with
+    TTS_MODEL, TTS_VOICE, TTS_FORMAT, TTS_SPEED and TTS_BITRATE applied on top
+    """
+    base = get_profile(os.getenv('TTS_PROFILE') or 'hd')
+    speed = os.getenv('TTS_SPEED')
+    # Empty variables (e.g. "TTS_BITRATE=") mean "not set"
+    return base.with_overrides(
+        model=os.getenv('TTS_MODEL') or None,
+        voice=os.getenv('TTS_VOICE') or None,
+        response_format=os.getenv('TTS_FORMAT') or None,
+        speed=float(speed) if speed else None,
+        bitrate=os.getenv('TTS_BITRATE') or None
+    )
+
+
+def get_profile(name: str) -> AudioProfile:
+    """Look up a named profile"""
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown audio profile: {name}")
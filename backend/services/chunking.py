@@ -0,0 +1,286 @@
+# backend/services/chunking.py
+import re
+from typing import List, NamedTuple, Optional
+
+# Sentence ends, clause boundaries inside a sentence, and markdown block breaks
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+CLAUSE_SPLIT = re.compile(r'(?<=[,;:–—])\s+')
+BLOCK_SPLIT = re.compile(r'\n{2,}')
+
+# Cost of ending a chunk after each kind of unit. A 10% deviation from the
+# target chunk size costs 1.0, so these are traded off against balance.
+BREAK_BEFORE_HEADING = 0.0
+BREAK_AFTER_PARAGRAPH = 0.25
+BREAK_AFTER_SENTENCE = 1.0
+BREAK_MID_SENTENCE = 3.0
+BREAK_AFTER_HEADING = 4.0
+
+
+class _Unit(NamedTuple):
+    text: str
+    sentence_end: bool
+    paragraph_end: bool
+    heading: bool  # Ends a heading block
+    starts_heading: bool  # Starts a heading block
+
+
+class ChunkPlanner:
+    """
+    Plans TTS chunks for the markdown produced by scrape_content.
+
+    Uses the minimum number of chunks that fit within max_chars, balances their
+    sizes so no single request dominates, and prefers to break at headings and
+    paragraphs. Sentences longer than max_chars are split at clause or word
+    boundaries so every chunk is accepted by the API.
+    """
+
+    def __init__(self, max_chars: int = 4000, first_chunk_chars: Optional[int] = None):
+        self.max_chars = max_chars
+        self.first_chunk_chars = first_chunk_chars
+        # Short units are merged up to this size before balancing, which bounds
+        # the units per chunk (and so the planning cost) at about 100
+        self.granularity = max(1, max_chars // 100)
+
+    def plan(self, text: str, first_chunk_chars: Optional[int] = None) -> List[str]:
+        """
+        Split text into balanced chunks.
+
+        If first_chunk_chars is given (or set on the planner), the first chunk is
+        packed up to that size so the opening audio is ready quickly; the rest of
+        the text is balanced as usual.
+        """
+        units = self._units(text)
+        if not units:
+            return []
+
+        first_chunk_chars = first_chunk_chars or self.first_chunk_chars
+        chunks = []
+        if first_chunk_chars and first_chunk_chars < self.max_chars:
+            end = self._pack_first(units, first_chunk_chars)
+            chunks.append(self._join(units[:end]))
+            units = units[end:]
+
+        if units:
+            chunks.extend(self._join(group) for group in self._balance(units))
+        return chunks
+
+    def first_chunk(self, text: str, first_chunk_chars: int) -> str:
+        """The opening chunk plan() produces for first_chunk_chars, without planning the rest"""
+        units = self._units(text)
+        if not units:
+            return ""
+        return self._join(units[:self._pack_first(units, first_chunk_chars)])
+
+    def _units(self, text: str) -> List[_Unit]:
+        """Break markdown into the smallest pieces a chunk may start or end on"""
+        units = []
+        for block in BLOCK_SPLIT.split(text.strip()):
+            block = block.strip()
+            if not block:
+                continue
+            heading = block.startswith('#')
+
+            pieces = []
+            for sentence in SENTENCE_SPLIT.split(block):
+                fragments = self._hard_split(sentence)
+                pieces.extend((fragment, i == len(fragments) - 1) for i, fragment in enumerate(fragments))
+
+            for i, (piece, sentence_end) in enumerate(pieces):
+                units.append(_Unit(piece, sentence_end, i == len(pieces) - 1, heading, heading))
+        return units
+
+    def _hard_split(self, sentence: str) -> List[str]:
+        """Split an oversized sentence at clauses, then words, then characters"""
+        if len(sentence) <= self.max_chars:
+            return [sentence]
+
+        fragments = []
+        for clause in CLAUSE_SPLIT.split(sentence):
+            if len(clause) <= self.max_chars:
+                fragments.append(clause)
+                continue
+
+            # Aim for evenly sized fragments rather than full ones plus a short tail
+            pieces = -(-len(clause) // self.max_chars)
+            limit = min(self.max_chars, -(-len(clause) // pieces))
+            current = ""
+            for word in clause.split():
+                # A single "word" longer than the limit (e.g. a long URL)
+                while len(word) > self.max_chars:
+                    if current:
+                        fragments.append(current)
+                        current = ""
+                    fragments.append(word[:self.max_chars])
+                    word = word[self.max_chars:]
+                if current and len(current) + 1 + len(word) > limit:
+                    fragments.append(current)
+                    current = word
+                else:
+                    current = f"{current} {word}" if current else word
+            if current:
+                fragments.append(current)
+        return fragments
+
+    @staticmethod
+    def _separator(unit: _Unit) -> str:
+        return "\n\n" if unit.paragraph_end else " "
+
+    def _join(self, units: List[_Unit]) -> str:
+        return "".join(unit.text + self._separator(unit) for unit in units).strip()
+
+    def _prefix_sizes(self, units: List[_Unit]) -> List[int]:
+        prefix = [0]
+        for unit in units:
+            prefix.append(prefix[-1] + len(unit.text) + len(self._separator(unit)))
+        return prefix
+
+    def _size(self, prefix: List[int], units: List[_Unit], start: int, end: int) -> int:
+        """Length of the joined chunk units[start:end]"""
+        return prefix[end] - prefix[start] - len(self._separator(units[end - 1]))
+
+    def _pack_first(self, units: List[_Unit], limit: int) -> int:
+        """Greedily fill the opening chunk; always takes at least one unit"""
+        prefix = self._prefix_sizes(units)
+        end = 1
+        while end < len(units) and self._size(prefix, units, 0, end + 1) <= limit:
+            end += 1
+        return end
+
+    @staticmethod
+    def _break_penalty(units: List[_Unit], end: int) -> float:
+        """Cost of ending a chunk right before units[end]"""
+        if end >= len(units):
+            return 0.0
+        last = units[end - 1]
+        if last.heading and last.paragraph_end:
+            return BREAK_AFTER_HEADING
+        if last.paragraph_end:
+            return BREAK_BEFORE_HEADING if units[end].starts_heading else BREAK_AFTER_PARAGRAPH
+        if last.sentence_end:
+            return BREAK_AFTER_SENTENCE
+        return BREAK_MID_SENTENCE
+
+    def _greedy_ends(self, prefix: List[int], units: List[_Unit]) -> List[int]:
+        """
+        Chunk boundaries of greedy packing, which gives the fewest chunks for a
+        fixed unit order; boundary k is the furthest units[:j] reaches in k chunks
+        """
+        ends, start = [0], 0
+        while start < len(units):
+            end = start + 1
+            while end < len(units) and self._size(prefix, units, start, end + 1) <= self.max_chars:
+                end += 1
+            ends.append(end)
+            start = end
+        return ends
+
+    def _greedy_starts(self, prefix: List[int], units: List[_Unit], count: int) -> List[int]:
+        """Boundary k is the earliest j for which units[j:] still fits in count - k chunks"""
+        starts = [0] * (count + 1)
+        starts[count] = end = len(units)
+        for k in range(count - 1, 0, -1):
+            start = max(end - 1, 0)
+            while start > 0 and self._size(prefix, units, start - 1, end) <= self.max_chars:
+                start -= 1
+            starts[k] = end = start
+        return starts
+
+    def _coarsen(self, units: List[_Unit]) -> List[_Unit]:
+        """Merge runs of short units so no unit is shorter than the granularity"""
+        merged = []
+        for unit in units:
+            previous = merged[-1] if merged else None
+            if (
+                previous is None
+                or len(previous.text) >= self.granularity
+                # Never build a unit that could not fit in a chunk on its own
+                or len(previous.text) + len(self._separator(previous)) + len(unit.text) > self.max_chars
+            ):
+                merged.append(unit)
+                continue
+            merged[-1] = _Unit(
+                previous.text + self._separator(previous) + unit.text,
+                unit.sentence_end,
+                unit.paragraph_end,
+                unit.heading,
+                previous.starts_heading
+            )
+        return merged
+
+    def _balance(self, units: List[_Unit]) -> List[List[_Unit]]:
+        """
+        Partition units into the minimum number of chunks, minimising the squared
+        deviation from the mean chunk size plus the boundary penalties.
+        """
+        prefix = self._prefix_sizes(units)
+        count = len(self._greedy_ends(prefix, units)) - 1
+        if count == 1:
+            return [units]
+
+        # Plan on merged units unless merging would cost an extra chunk, which
+        # only happens when the text nearly fills every chunk; fall back to the
+        # original units if the merged ones leave no feasible plan
+        coarse = self._coarsen(units)
+        coarse_prefix = self._prefix_sizes(coarse)
+        if len(self._greedy_ends(coarse_prefix, coarse)) - 1 == count:
+            groups = self._partition(coarse, coarse_prefix, count)
+            if groups is not None:
+                return groups
+
+        return self._partition(units, prefix, count)
+
+    def _partition(self, units: List[_Unit], prefix: List[int], count: int) -> Optional[List[List[_Unit]]]:
+        """
+        Dynamic program behind _balance; returns None when units cannot be split
+        into count chunks within max_chars
+        """
+        n = len(units)
+        # Chunk k must end between the earliest boundary that leaves room for the
+        # remaining chunks and the furthest boundary greedy packing reaches
+        earliest = self._greedy_starts(prefix, units, count)
+        latest = self._greedy_ends(prefix, units)
+
+        # Chunk units[i:j] has length prefix[j] - prefix[i] - trailing[j - 1]
+        trailing = [len(self._separator(unit)) for unit in units]
+        penalties = [self._break_penalty(units, j) for j in range(n + 1)]
+        max_chars = self.max_chars
+        target = prefix[n] / count
+        scale = max(target * 0.1, 1.0)
+        inf = float('inf')
+
+        # best[k][j]: lowest cost of packing units[:j] into k chunks
+        best = [[inf] * (n + 1) for _ in range(count + 1)]
+        back = [[0] * (n + 1) for _ in range(count + 1)]
+        best[0][0] = 0.0
+
+        for k in range(1, count + 1):
+            previous = best[k - 1]
+            current = best[k]
+            pointers = back[k]
+            lowest_start = earliest[k - 1]
+            for j in range(max(earliest[k], k), latest[k] + 1):
+                end = prefix[j] - trailing[j - 1]
+                penalty = penalties[j]
+                for i in range(min(j - 1, latest[k - 1]), lowest_start - 1, -1):
+                    size = end - prefix[i]
+                    if size > max_chars:
+                        break
+                    if previous[i] == inf:
+                        continue
+                    deviation = (size - target) / scale
+                    cost = previous[i] + deviation * deviation + penalty
+                    if cost < current[j]:
+                        current[j] = cost
+                        pointers[j] = i
+
+        if best[count][n] == inf:
+            return None
+
+        groups = []
+        j = n
+        for k in range(count, 0, -1):
+            i = back[k][j]
+            groups.append(units[i:j])
+            j = i
+        groups.reverse()
+        return groups
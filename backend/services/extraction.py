@@ -0,0 +1,132 @@
+# backend/services/extraction.py
+import re
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup, Tag
+import soupsieve as sv
+
+CONTENT_CLASS = re.compile(r'article|content|post|entry')
+CONTENT_TAGS = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'blockquote']
+
+# Catch-all elements are used as a fallback but never learned for a host: they
+# nearly always have enough text, so a learned one would shadow article/main
+UNLEARNABLE_TAGS = ('html', 'body')
+
+# A selector is only learned, and only counts as a hit, if its element has at
+# least this much text
+MIN_CONTENT_LENGTH = 200
+
+# Hand-written rules for sites where the generic cascade picks the wrong element
+SITE_RULES = {
+    'substack.com': 'div.available-content',
+    'dev.to': '#article-body',
+    'en.wikipedia.org': '#mw-content-text',
+    'github.com': 'article.markdown-body',
+}
+
+
+def _host(url: str) -> str:
+    host = (urlparse(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def _content_length(element: Tag, minimum: int = MIN_CONTENT_LENGTH) -> int:
+    """Length of the text scrape_content would extract, stopping once minimum is reached"""
+    length = 0
+    for tag in element.find_all(CONTENT_TAGS):
+        length += len(tag.get_text(strip=True))
+        if length >= minimum:
+            break
+    return length
+
+
+def _class_selector(element: Tag) -> Optional[str]:
+    """CSS selector for an element found by the content class regex"""
+    for css_class in element.get('class', []):
+        if CONTENT_CLASS.search(css_class):
+            return f"{element.name}.{sv.escape(css_class)}"
+    return None
+
+
+class ExtractionProfileStore:
+    """
+    Remembers, per host, which specific selector (article, main or a content
+    class) found the main content so later pages skip the cascade. Hand-written
+    site rules are tried first; the cascade only runs when neither the rule nor
+    the learned selector yields enough content, and then picks the first match
+    as before. The body fallback is never learned.
+    """
+
+    def __init__(self, site_rules: Optional[Dict[str, str]] = None):
+        rules = SITE_RULES if site_rules is None else site_rules
+        self.site_rules = {host: sv.compile(selector) for host, selector in rules.items()}
+        self.profiles: Dict[str, sv.SoupSieve] = {}
+        self.host_stats: Dict[str, Dict[str, int]] = {}
+
+    def _site_rule(self, host: str) -> Optional[sv.SoupSieve]:
+        for rule_host, selector in self.site_rules.items():
+            if host == rule_host or host.endswith(f".{rule_host}"):
+                return selector
+        return None
+
+    def _record(self, host: str, outcome: str) -> None:
+        stats = self.host_stats.setdefault(host, {'hits': 0, 'misses': 0})
+        stats[outcome] += 1
+
+    def _cascade(self, soup: BeautifulSoup) -> List[tuple]:
+        """The original priority order, evaluated lazily: (selector, finder)"""
+        return [
+            ('article', lambda: soup.find('article')),
+            ('main', lambda: soup.find('main')),
+            (None, lambda: soup.find(class_=CONTENT_CLASS)),
+            ('body', lambda: soup.find('body')),
+        ]
+
+    def find_main_content(self, soup: BeautifulSoup, url: str) -> Optional[Tag]:
+        """Return the main content element for a page, learning the selector for its host"""
+        host = _host(url)
+
+        for selector in (self._site_rule(host), self.profiles.get(host)):
+            if selector is None:
+                continue
+            element = selector.select_one(soup)
+            if element is not None and _content_length(element) >= MIN_CONTENT_LENGTH:
+                self._record(host, 'hits')
+                return element
+
+        # Known selectors failed (or none yet): forget the stale one and fall back
+        self.profiles.pop(host, None)
+        self._record(host, 'misses')
+
+        # Same selection as before: the first cascade match wins. Its selector is
+        # only learned if it found enough text and is not a catch-all element.
+        for selector, finder in self._cascade(soup):
+            element = finder()
+            if element is None:
+                continue
+            if element.name not in UNLEARNABLE_TAGS and _content_length(element) >= MIN_CONTENT_LENGTH:
+                selector = selector or _class_selector(element)
+                if selector:
+                    self.profiles[host] = sv.compile(selector)
+            return element
+
+        return None
+
+    def stats(self) -> dict:
+        """Overall and per-host hit rates of the learned and hand-written selectors"""
+        hits = sum(stats['hits'] for stats in self.host_stats.values())
+        misses = sum(stats['misses'] for stats in self.host_stats.values())
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / total if total else 0.0,
+            'hosts': {
+                host: {
+                    **stats,
+                    'hit_rate': stats['hits'] / (stats['hits'] + stats['misses']),
+                    'selector': self.profiles[host].pattern if host in self.profiles else None,
+                }
+                for host, stats in self.host_stats.items()
+            },
+        }
@@ -5,11 +5,14 @@ import os
 import boto3
 from typing import List, Dict
 import requests
+import threading
 
 class RSSFeed:
     def __init__(self, temp_dir: str):
         self.temp_dir = temp_dir
         self.feed_path = os.path.join(temp_dir, 'feed.xml')
+        # add_item runs in worker threads; serialize the download-modify-upload cycle
+        self._lock = threading.Lock()
         self.s3_client = boto3.client(
             's3',
             aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
@@ -34,7 +37,12 @@ class RSSFeed:
         return f"https://{self.cloudfront_domain}/{s3_key}"
     
     # backend/services/feed.py
-    def add_item(self, title: str, audio_url: str, source_url: str) -> None:
+    def add_item(self, title: str, audio_url: str, source_url: str, content_type: str = 'audio/mpeg') -> None:
+        """Blocking (HTTP and S3 calls); run it with asyncio.to_thread from async code"""
+        with self._lock:
+            self._add_item(title, audio_url, source_url, content_type)
+
+    def _add_item(self, title: str, audio_url: str, source_url: str, content_type: str) -> None:
         # Get existing feed or create new one
         root = self._download_feed()
         channel = root.find('channel')
@@ -61,7 +69,7 @@ class RSSFeed:
         
         enclosure = ET.SubElement(item, 'enclosure')
         enclosure.set('url', audio_url)
-        enclosure.set('type', 'audio/mpeg')
+        enclosure.set('type', content_type)
         enclosure.set('length', str(file_size))
         
         # Save locally and upload to S3
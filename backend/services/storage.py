@@ -1,9 +1,12 @@
 # backend/services/storage.py
+import asyncio
 import boto3
 import os
 from datetime import datetime
 import re
 from urllib.parse import quote
+from typing import Optional
+from services.audio_profile import AudioProfile
 
 class S3Storage:
     def __init__(self):
@@ -26,20 +29,25 @@ class S3Storage:
         safe_title = safe_title.strip('-')
         return safe_title
 
-    async def upload_audio(self, file_path: str, title: str) -> str:
+    async def upload_audio(self, file_path: str, title: str, profile: Optional[AudioProfile] = None) -> str:
+        # Extension and content type follow the audio profile (MP3 by default)
+        extension = profile.extension if profile else 'mp3'
+        content_type = profile.content_type if profile else 'audio/mpeg'
+
         # Create safe filename
         safe_title = self._sanitize_filename(title)
         timestamp = datetime.now().strftime('%Y%m%d-%H%M%S')
-        key = f"audio/{timestamp}-{safe_title}.mp3"
+        key = f"audio/{timestamp}-{safe_title}.{extension}"
 
         try:
-            # Upload to S3
-            self.s3_client.upload_file(
+            # Upload to S3 in a worker thread; boto3 blocks
+            await asyncio.to_thread(
+                self.s3_client.upload_file,
                 file_path, 
                 self.bucket_name, 
                 key,
                 ExtraArgs={
-                    'ContentType': 'audio/mpeg'
+                    'ContentType': content_type
                 }
             )
             
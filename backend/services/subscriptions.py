@@ -0,0 +1,251 @@
+# backend/services/subscriptions.py
+import asyncio
+import json
+import os
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urldefrag
+import httpx
+
+ATOM_NS = '{http://www.w3.org/2005/Atom}'
+SITEMAP_NS = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+MAX_SEEN = 500  # Article URLs remembered per source (at least the current feed length)
+MAX_RESULTS = 1000  # Pre-built articles kept before the oldest are dropped
+
+
+def normalize_url(url: str) -> str:
+    """Drop whitespace and fragments so feed links match user-submitted URLs"""
+    return urldefrag(url.strip())[0]
+
+
+def parse_entries(xml_text: bytes) -> List[str]:
+    """Article URLs from an RSS 2.0 feed, Atom feed or sitemap, newest first where known"""
+    root = ET.fromstring(xml_text)
+
+    if root.tag == 'rss':
+        return [
+            item.findtext('link').strip()
+            for item in root.iter('item')
+            if item.findtext('link')
+        ]
+
+    if root.tag == f'{ATOM_NS}feed':
+        links = []
+        for entry in root.iter(f'{ATOM_NS}entry'):
+            for link in entry.findall(f'{ATOM_NS}link'):
+                if link.get('rel', 'alternate') == 'alternate' and link.get('href'):
+                    links.append(link.get('href').strip())
+                    break
+        return links
+
+    if root.tag == f'{SITEMAP_NS}urlset':
+        entries = [
+            (url.findtext(f'{SITEMAP_NS}lastmod') or '', url.findtext(f'{SITEMAP_NS}loc').strip())
+            for url in root.iter(f'{SITEMAP_NS}url')
+            if url.findtext(f'{SITEMAP_NS}loc')
+        ]
+        entries.sort(key=lambda entry: entry[0], reverse=True)
+        return [loc for _, loc in entries]
+
+    raise ValueError(f"Unsupported feed format: {root.tag}")
+
+
+class SubscriptionService:
+    """
+    Polls subscribed RSS/Atom feeds and sitemaps with conditional GETs and
+    pre-builds new articles in the background, so a later conversion request
+    for one of them is answered from the stored result.
+    """
+
+    def __init__(
+        self,
+        data_dir: str,
+        build_article: Callable[[str], Awaitable[dict]],
+        poll_interval: int = 900,
+        max_concurrency: int = 2,
+        backfill: int = 3
+    ):
+        self.data_path = os.path.join(data_dir, 'subscriptions.json')
+        self.build_article = build_article
+        self.poll_interval = poll_interval
+        self.backfill = backfill  # Articles pre-built from a newly added source
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.sources: Dict[str, dict] = {}
+        self.results: Dict[str, dict] = {}
+        self.pending: Dict[str, asyncio.Task] = {}
+        self._poller: Optional[asyncio.Task] = None
+        self._polls = set()
+        self._polling = set()  # Sources with a poll in flight
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.data_path) as f:
+                data = json.load(f)
+            self.sources = data.get('sources', {})
+            self.results = data.get('results', {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error loading subscriptions: {str(e)}")
+
+    def _save(self) -> None:
+        try:
+            with open(self.data_path, 'w') as f:
+                json.dump({'sources': self.sources, 'results': self.results}, f)
+        except Exception as e:
+            print(f"Error saving subscriptions: {str(e)}")
+
+    @staticmethod
+    def _summary(source: dict) -> dict:
+        return {key: value for key, value in source.items() if key != 'seen'}
+
+    def add(self, source_url: str) -> dict:
+        """Register a feed or sitemap; adding an existing source returns it unchanged"""
+        url = normalize_url(source_url)
+        if not url.startswith(('http://', 'https://')):
+            raise ValueError(f"Invalid source URL: {source_url}")
+
+        source = self.sources.setdefault(url, {
+            'url': url,
+            'etag': None,
+            'last_modified': None,
+            'last_polled': None,
+            'error': None,
+            'backfilled': False,
+            'seen': [],
+        })
+        self._save()
+        return self._summary(source)
+
+    def remove(self, source_url: str) -> bool:
+        removed = self.sources.pop(normalize_url(source_url), None) is not None
+        if removed:
+            self._save()
+        return removed
+
+    def list_sources(self) -> List[dict]:
+        return [self._summary(source) for source in self.sources.values()]
+
+    async def poll(self, source_url: str) -> List[str]:
+        """Fetch a source if it changed and schedule its new articles; returns their URLs"""
+        source = self.sources.get(source_url)
+        if source is None or source_url in self._polling:
+            # Skip overlapping polls (e.g. poll_soon racing the scheduled run)
+            return []
+
+        self._polling.add(source_url)
+        try:
+            return await self._poll(source_url, source)
+        finally:
+            self._polling.discard(source_url)
+
+    async def _poll(self, source_url: str, source: dict) -> List[str]:
+        headers = {'User-Agent': USER_AGENT}
+        if source['etag']:
+            headers['If-None-Match'] = source['etag']
+        if source['last_modified']:
+            headers['If-Modified-Since'] = source['last_modified']
+
+        source['last_polled'] = datetime.now().isoformat()
+
+        try:
+            async with httpx.AsyncClient() as client:
+                response = await client.get(source_url, headers=headers, follow_redirects=True, timeout=30)
+            if response.status_code == 304:
+                source['error'] = None
+                self._save()
+                return []
+            response.raise_for_status()
+            links = [normalize_url(link) for link in parse_entries(response.content)]
+
+        except (httpx.HTTPError, ET.ParseError, ValueError) as e:
+            print(f"Error polling {source_url}: {str(e)}")
+            source['error'] = str(e)
+            self._save()
+            return []
+
+        source['etag'] = response.headers.get('etag')
+        source['last_modified'] = response.headers.get('last-modified')
+        source['error'] = None
+
+        seen = set(source['seen'])
+        new_links = list(dict.fromkeys(link for link in links if link not in seen))
+        # Sources saved before the flag existed count as backfilled once they have seen links
+        if not source.get('backfilled', bool(source['seen'])):
+            # Only backfill the latest few articles of a newly added source. The
+            # flag is set only after a successful parse, so a failed first poll
+            # does not let the next one pre-build the whole feed.
+            new_links = new_links[:self.backfill]
+        source['backfilled'] = True
+
+        current = set(links)
+        source['seen'] = (links + [link for link in source['seen'] if link not in current])[:max(MAX_SEEN, len(links))]
+        self._save()
+
+        for link in new_links:
+            self.prefetch(link)
+        return new_links
+
+    def poll_soon(self, source_url: str) -> None:
+        """Poll a source in the background instead of waiting for the next scheduled run"""
+        task = asyncio.create_task(self.poll(normalize_url(source_url)))
+        self._polls.add(task)
+        task.add_done_callback(self._polls.discard)
+
+    async def poll_all(self) -> None:
+        await asyncio.gather(*(self.poll(url) for url in list(self.sources)))
+
+    def prefetch(self, url: str) -> None:
+        """Schedule a background build unless the article is already built or in progress"""
+        url = normalize_url(url)
+        if url in self.results or url in self.pending:
+            return
+        self.pending[url] = asyncio.create_task(self._build(url))
+
+    async def _build(self, url: str) -> None:
+        try:
+            async with self.semaphore:
+                result = await self.build_article(url)
+            self.results[url] = {**result, 'built_at': datetime.now().isoformat()}
+            while len(self.results) > MAX_RESULTS:
+                self.results.pop(next(iter(self.results)))
+            self._save()
+            print(f"Pre-built article: {url}")
+        except Exception as e:
+            print(f"Error pre-building {url}: {str(e)}")
+        finally:
+            self.pending.pop(url, None)
+
+    async def lookup(self, url: str) -> Optional[dict]:
+        """Pre-built result for an article URL, waiting for it if a build is in progress"""
+        url = normalize_url(url)
+        task = self.pending.get(url)
+        if task:
+            # Shield so a disconnecting client does not cancel the background build
+            await asyncio.shield(task)
+        return self.results.get(url)
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.poll_all()
+            except Exception as e:
+                print(f"Error polling subscriptions: {str(e)}")
+            await asyncio.sleep(self.poll_interval)
+
+    def start(self) -> None:
+        if self._poller is None:
+            self._poller = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        tasks = list(self.pending.values()) + list(self._polls)
+        if self._poller:
+            tasks.append(self._poller)
+            self._poller = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -3,92 +3,170 @@ from openai import AsyncOpenAI
 import os
 from pathlib import Path
 import tempfile
-import re
+import hashlib
+import uuid
+from typing import Optional
+import asyncio
 from pydub import AudioSegment
+from services.chunking import ChunkPlanner
+from services.audio_profile import AudioProfile, default_profile
 
 class AudioService:
     def __init__(self):
         self.client = AsyncOpenAI(api_key=os.getenv('OPENAI_API_KEY'))
         self.temp_dir = Path(tempfile.gettempdir()) / "podcast-audio"
         self.temp_dir.mkdir(exist_ok=True)
+        self.segment_dir = self.temp_dir / "segments"
+        self.segment_dir.mkdir(exist_ok=True)
         self.chunk_size = 4000  # Slightly less than 4096 to account for any extra characters
+        self.preview_size = 600  # Roughly the first 100 words
+        self.planner = ChunkPlanner(max_chars=self.chunk_size)
+        self.default_profile = default_profile()
 
-    def split_text(self, text: str) -> list[str]:
+    def split_text(self, text: str, first_chunk_size: Optional[int] = None) -> list[str]:
         """
-        Split text into chunks that respect sentence boundaries and stay within OpenAI's limit
+        Split text into balanced chunks that respect paragraph and sentence boundaries
+        and stay within OpenAI's limit
         """
-        # Split into sentences (basic implementation)
-        sentences = re.split(r'(?<=[.!?])\s+', text)
-        chunks = []
-        current_chunk = ""
-
-        for sentence in sentences:
-            # If adding this sentence would exceed chunk size, start a new chunk
-            if len(current_chunk) + len(sentence) > self.chunk_size:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                current_chunk = sentence
-            else:
-                current_chunk += " " + sentence if current_chunk else sentence
+        return self.planner.plan(text, first_chunk_chars=first_chunk_size)
+
+    def preview_profile(self, profile: Optional[AudioProfile] = None) -> AudioProfile:
+        """Low-latency variant of a profile: same voice, speed and format on tts-1"""
+        profile = profile or self.default_profile
+        return AudioProfile(
+            model='tts-1',
+            voice=profile.voice,
+            response_format=profile.response_format,
+            speed=profile.speed
+        )
+
+    @staticmethod
+    def _partial_path(path: Path) -> Path:
+        """Unique temporary name next to path, so concurrent writers never share it"""
+        return path.with_name(f"partial_{uuid.uuid4().hex}_{path.name}")
+
+    def _write_atomic(self, path: Path, content: bytes) -> None:
+        """
+        Write to a temporary name and rename into place; cache checks use
+        path.exists(), so readers must never see a half-written file
+        """
+        partial_path = self._partial_path(path)
+        with open(partial_path, 'wb') as f:
+            f.write(content)
+        os.replace(partial_path, path)
+
+    def _segment_path(self, text: str, profile: AudioProfile) -> Path:
+        text_hash = hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+        return self.segment_dir / f"segment_{text_hash}_{profile.cache_key()}.{profile.extension}"
+
+    async def synthesize_segment(self, text: str, profile: AudioProfile) -> Path:
+        """Synthesize a single chunk, reusing the cached file if it already exists"""
+        path = self._segment_path(text, profile)
+        if not path.exists():
+            response = await self.client.audio.speech.create(
+                input=text,
+                **profile.speech_params()
+            )
+            self._write_atomic(path, response.content)
+        return path
+
+    async def create_preview(self, text: str, profile: Optional[AudioProfile] = None) -> str:
+        """
+        Synthesize the opening chunk of the article with the low-latency model.
+        The chunk is the same one the planner opens the full article with, so
+        create_audio reuses this file instead of synthesizing it again.
+        """
+        try:
+            opening = self.planner.first_chunk(text, self.preview_size)
+            path = await self.synthesize_segment(opening, self.preview_profile(profile))
+            return str(path)
 
-        # Add the last chunk if it exists
-        if current_chunk:
-            chunks.append(current_chunk.strip())
+        except Exception as e:
+            print(f"Error creating preview: {str(e)}")
+            raise e
+
+    def _combine_segments(self, segment_paths: list[Path], final_path: Path, profile: AudioProfile) -> None:
+        """Concatenate segment files with short pauses and export them in the profile format"""
+        combined = AudioSegment.empty()
+
+        for segment_path in segment_paths:
+            # Add to combined audio with a small pause between chunks
+            chunk_audio = AudioSegment.from_file(segment_path, format=profile.decode_format)
+            silence = AudioSegment.silent(duration=500)  # 500ms pause
+            combined += chunk_audio + silence
 
-        return chunks
+        # Export to a temporary name first so a concurrent request never picks up
+        # a half-written file from the cache, re-encoding at the profile bitrate if set
+        partial_path = self._partial_path(final_path)
+        combined.export(
+            partial_path,
+            format=profile.export_format,
+            codec=profile.codec,
+            bitrate=profile.bitrate
+        ).close()
+        os.replace(partial_path, final_path)
 
-    async def create_audio(self, text: str, title: str) -> str:
+    async def create_audio(self, text: str, title: str, profile: Optional[AudioProfile] = None) -> str:
         """
-        Convert text to speech, handling long texts by splitting into chunks
+        Convert text to speech, handling long texts by splitting into chunks.
+        Audio is cached per text and profile, so repeated requests reuse the file.
         """
         try:
-            # Generate unique filename for final output
-            filename = f"audio_{hash(text)}.mp3"
+            profile = profile or self.default_profile
+
+            # Stable filename from the text and the profile settings
+            text_hash = hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+            filename = f"audio_{text_hash}_{profile.cache_key()}.{profile.extension}"
             final_path = self.temp_dir / filename
 
-            # Split text into chunks if necessary
-            chunks = self.split_text(text)
+            if final_path.exists():
+                return str(final_path)
+
+            # If a preview was generated for this text, plan around it and use it
+            # as the opening segment. It is only reused when more chunks follow;
+            # a text that fits in the preview is synthesized with this profile.
+            opening = []
+            chunks = None
+            preview_path = self._segment_path(
+                self.planner.first_chunk(text, self.preview_size),
+                self.preview_profile(profile)
+            )
+            if preview_path.exists():
+                planned = self.split_text(text, first_chunk_size=self.preview_size)
+                if len(planned) > 1:
+                    opening = [preview_path]
+                    chunks = planned[1:]
+
+            if chunks is None:
+                chunks = self.split_text(text)
             
-            if len(chunks) == 1:
+            if not opening and len(chunks) == 1 and not profile.bitrate:
                 # If only one chunk, process normally
                 response = await self.client.audio.speech.create(
-                    model="tts-1-hd",
-                    voice="echo",
-                    input=chunks[0]
+                    input=chunks[0],
+                    **profile.speech_params()
                 )
                 
-                with open(final_path, 'wb') as f:
-                    f.write(response.content)
+                self._write_atomic(final_path, response.content)
                     
             else:
-                # Process multiple chunks and combine
-                temp_files = []
-                combined = AudioSegment.empty()
-
-                for i, chunk in enumerate(chunks):
-                    # Generate audio for chunk
-                    response = await self.client.audio.speech.create(
-                        model="tts-1-hd",
-                        voice="echo",
-                        input=chunk
-                    )
-                    
-                    # Save chunk to temporary file
-                    chunk_path = self.temp_dir / f"temp_chunk_{i}_{filename}"
-                    with open(chunk_path, 'wb') as f:
-                        f.write(response.content)
-                    
-                    temp_files.append(chunk_path)
-                    
-                    # Add to combined audio with a small pause between chunks
-                    chunk_audio = AudioSegment.from_mp3(chunk_path)
-                    silence = AudioSegment.silent(duration=500)  # 500ms pause
-                    combined += chunk_audio + silence
-                
-                # Export final combined audio
-                combined.export(final_path, format="mp3")
+                # Synthesize all chunks concurrently; balanced chunks keep the
+                # slowest request close to the average
+                temp_files = await asyncio.gather(*(
+                    self.synthesize_segment(chunk, profile)
+                    for chunk in chunks
+                ))
+
+                # Decoding and re-encoding are CPU-bound ffmpeg work; keep them
+                # off the event loop so other requests are not blocked
+                await asyncio.to_thread(
+                    self._combine_segments,
+                    opening + list(temp_files),
+                    final_path,
+                    profile
+                )
                 
-                # Clean up temporary chunk files
+                # Clean up temporary chunk files; the preview stays cached
                 for temp_file in temp_files:
                     try:
                         os.remove(temp_file)
@@ -99,4 +177,4 @@ class AudioService:
 
         except Exception as e:
             print(f"Error creating audio: {str(e)}")
-            raise e
\ No newline at end of file
+            raise e